@@ -1,99 +1,522 @@
+import atexit
+import bisect
 import contextlib
+import hashlib
 import json
+import mmap
 import os
+import queue
+import re
+import shutil
+import struct
+import tempfile
 import threading
 import time
 import tkinter as tk
 import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from tkinter import filedialog
 from typing import Union
 
-import mutagen
+import numpy as np
+import onnxruntime
 import piper
+from piper.config import PiperConfig
+from piper.const import BOS, EOS, PAD
 
 with contextlib.redirect_stdout(None):  # Suppress pygame welcome message
     import pygame.mixer
 
 import requests
-from pydub import AudioSegment
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Download block size; large blocks mean fewer Python iterations and write() syscalls
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Large downloads from servers that accept byte ranges are split across this many connections
+DOWNLOAD_CONNECTIONS = 4
+PARALLEL_DOWNLOAD_MIN_SIZE = 16 * 1024 * 1024
+# Playback position polling interval; the UI only shows whole seconds
+POSITION_UPDATE_MS = 250
+# Minimum interval between progress messages posted from worker threads
+STATUS_UPDATE_INTERVAL = 0.5
+# How often the Tk thread runs UI updates queued by worker threads
+UI_QUEUE_POLL_MS = 50
+# Worker threads shared by background jobs (downloads, file loading, duration, export)
+BACKGROUND_WORKERS = 2
+# Window resizes are applied to the layout at most this often
+RESIZE_DEBOUNCE_MS = 50
+# Delay used to coalesce bursts of config saves (e.g. while scrubbing) into one write
+CONFIG_SAVE_DELAY_MS = 500
+# Mixer output matches Piper's 22.05 kHz mono PCM so SDL doesn't resample; a large buffer means fewer wakeups
+MIXER_FREQUENCY = 22050
+MIXER_BUFFER = 4096
+# MP3 export settings: 64 kbps is plenty for mono speech, and LAME quality 5 encodes much faster than the default
+MP3_BITRATE = 64
+MP3_QUALITY = 5
+# Places where a chunk may end: sentence-ending punctuation followed by whitespace, or a blank line
+SENTENCE_BOUNDARY = re.compile(r'[.!?](?=\s)|\n\n')
+# Upper bound for the per-chunk PCM cache; least recently used chunks are evicted beyond it
+CHUNK_CACHE_LIMIT = 2 * 1024 ** 3
+# Upper bound for synthesized books kept in the temp directory; the open book is never evicted
+BOOK_CACHE_LIMIT = 5 * 1024 ** 3
+# ONNX Runtime execution providers in order of preference; the CPU provider is always available
+EXECUTION_PROVIDERS = ["CUDAExecutionProvider", "DmlExecutionProvider", "CoreMLExecutionProvider",
+                       "CPUExecutionProvider"]
+# British English Piper voices and the qualities they are published in
+AVAILABLE_VOICES = {
+    "alan": ["medium", "low"],
+    "alba": ["medium"],
+    "aru": ["medium"],
+    "cori": ["medium"],
+    "jenny_dioco": ["medium"],
+    "northern_english_male": ["medium"],
+    "semaine": ["medium"],
+    "southern_english_female": ["low"],
+    "vctk": ["medium"]
+}
+VOICES_URL = "https://huggingface.co/rhasspy/piper-voices/resolve/main/en/en_GB"
+# Per-provider session options; exhaustive cuDNN algorithm search is very slow for Piper's short, varying inputs
+PROVIDER_OPTIONS = {"CUDAExecutionProvider": {"cudnn_conv_algo_search": "HEURISTIC"}}
+# Providers a probe session actually got, by model path; probing loads the whole model, so it's done once per run
+PROBED_PROVIDERS = {}
+
+
+def preferred_providers(model_path: str) -> list:
+    """Return the execution providers a session for the model actually runs on, fastest first."""
+    available = onnxruntime.get_available_providers()
+    providers = [provider for provider in EXECUTION_PROVIDERS if provider in available]
+    if providers[0] == "CPUExecutionProvider":
+        return providers
+    if model_path in PROBED_PROVIDERS:
+        return list(PROBED_PROVIDERS[model_path])
+    # A build lists the providers it supports, not the devices present, so ask a session which one it got
+    sess_options = onnxruntime.SessionOptions()
+    sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+    try:
+        session = onnxruntime.InferenceSession(
+            model_path, sess_options=sess_options, providers=providers,
+            provider_options=[PROVIDER_OPTIONS.get(provider, {}) for provider in providers])
+        active = session.get_providers()[0]
+    except Exception as e:
+        print(f"Error probing execution providers: {e}")
+        active = "CPUExecutionProvider"
+    PROBED_PROVIDERS[model_path] = [active, "CPUExecutionProvider"] if active != "CPUExecutionProvider" else [active]
+    return list(PROBED_PROVIDERS[model_path])
+
+
+def create_http_session() -> requests.Session:
+    """Create a pooled, retrying HTTP session for downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=3, backoff_factor=0.5))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Ask for the raw body: models are already compressed and Content-Length stays usable for preallocation
+    session.headers['Accept-Encoding'] = 'identity'
+    return session
+
+
+def process_running(pid: int) -> bool:
+    """Return whether a process with the given id is still running."""
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows, so open it for querying instead
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running, but owned by another user
+        return True
+    return True
+
+
+# Shared by every download so connections are pooled across the app
+HTTP_SESSION = create_http_session()
+# Loaded voices by model, config, providers and quantization, shared by every TTS instance
+VOICE_CACHE = {}
+VOICE_CACHE_LOCK = threading.Lock()
+
+
+@dataclass
+class FastPiperVoice(piper.PiperVoice):
+    """PiperVoice that maps phonemes to ids through a table built once per voice."""
+
+    def __post_init__(self):
+        id_map = self.config.phoneme_id_map
+        pad_ids = list(id_map[PAD])
+        # Every phoneme expands to its ids followed by the pad id, as in PiperVoice.phonemes_to_ids
+        self.phoneme_ids_table = {phoneme: list(ids) + pad_ids for phoneme, ids in id_map.items()}
+        self.bos_ids = list(id_map[BOS])
+        self.eos_ids = list(id_map[EOS])
+
+    def phonemes_to_ids(self, phonemes: list) -> list:
+        """Phonemes to ids, silently skipping phonemes missing from the voice."""
+        table = self.phoneme_ids_table
+        return self.bos_ids + [i for phoneme in phonemes for i in table.get(phoneme, ())] + self.eos_ids
 
 
 class TTS:
-    def __init__(self, voice: str = None, model_path: str = None, config_path: str = None):
+    def __init__(self, voice: str = None, model_path: str = None, config_path: str = None, quantize: bool = True,
+                 use_gpu: bool = None):
         """Initialize the Text-to-Speech engine with a specified voice."""
-        available_voices = {
-            "alan": ["medium", "low"],
-            "alba": ["medium"],
-            "aru": ["medium"],
-            "cori": ["medium"],
-            "jenny_dioco": ["medium"],
-            "northern_english_male": ["medium"],
-            "semaine": ["medium"],
-            "southern_english_female": ["low"],
-            "vctk": ["medium"]
-        }
         self.voice = voice or "jenny_dioco"
-        quality = 'medium' if self.voice in available_voices and 'medium' in available_voices[self.voice] else 'low'
-        self.model_path = model_path or f"en_GB-{self.voice}-{quality}.onnx"
-        self.config_path = config_path or f"en_GB-{self.voice}-{quality}.onnx.json"
-        self.voice_model_url = f"https://huggingface.co/rhasspy/piper-voices/resolve/main/en/en_GB/{self.voice}/{quality}/en_GB-{self.voice}-{quality}.onnx"
-        self.voice_config_url = f"https://huggingface.co/rhasspy/piper-voices/resolve/main/en/en_GB/{self.voice}/{quality}/en_GB-{self.voice}-{quality}.onnx.json"
+        quality = 'medium' if 'medium' in AVAILABLE_VOICES.get(self.voice, []) else 'low'
+        name = f"en_GB-{self.voice}-{quality}"
+        self.model_path = model_path or f"{name}.onnx"
+        self.config_path = config_path or f"{name}.onnx.json"
+        self.voice_model_url = f"{VOICES_URL}/{self.voice}/{quality}/{name}.onnx"
+        self.voice_config_url = f"{VOICES_URL}/{self.voice}/{quality}/{name}.onnx.json"
 
         if not Path(self.model_path).exists():
             self.download_file(self.voice_model_url, self.model_path)
         if not Path(self.config_path).exists():
             self.download_file(self.voice_config_url, self.config_path)
-        self.voice_model = piper.PiperVoice.load(self.model_path, self.config_path)
+        self.providers = preferred_providers(self.model_path)
+        if use_gpu is None:
+            use_gpu = self.providers[0] != "CPUExecutionProvider"
+        if not use_gpu:
+            self.providers = ["CPUExecutionProvider"]
+        # Dynamic int8 quantization only pays off on the CPU provider
+        self.quantize = quantize and not use_gpu
+        # Chunks are synthesized concurrently, one inference per worker thread
+        self.workers = max(1, (os.cpu_count() or 1) - 1)
+        # Session creation takes seconds, so reuse a voice another TTS instance already loaded
+        key = (self.model_path, self.config_path, tuple(self.providers), self.quantize)
+        with VOICE_CACHE_LOCK:
+            if key not in VOICE_CACHE:
+                VOICE_CACHE[key] = self.load_voice()
+            # load_voice may have fallen back to the full-precision model
+            self.voice_model, self.quantize = VOICE_CACHE[key]
+        # Piper voices emit 16-bit mono PCM at the rate given in their config
+        self.sample_rate = self.voice_model.config.sample_rate
+        # Page in the weights and initialize ORT kernels now, so the first real chunk runs at full speed
+        threading.Thread(target=self.warm_up, daemon=True).start()
+
+    def warm_up(self) -> None:
+        """Run a throwaway synthesis."""
+        try:
+            self.synthesize_to_pcm("Ready.")
+        except Exception as e:
+            print(f"Error warming up the voice model: {e}")
+
+    def load_voice(self) -> tuple:
+        """Load the Piper voice, quantized if enabled, and return it with whether it is quantized."""
+        source_path = self.simplify_model()
+        if self.quantize:
+            try:
+                voice = self.create_voice(self.quantize_model(source_path))
+            except Exception as e:
+                print(f"Error loading the quantized voice model, using the full-precision model: {e}")
+            else:
+                if self.check_voice(voice):
+                    return voice, True
+                print("Quantized voice model produced no usable audio, using the full-precision model")
+        return self.create_voice(source_path), False
+
+    def check_voice(self, voice: FastPiperVoice) -> bool:
+        """Return whether a voice synthesizes finite, non-silent audio for a short phrase."""
+        # Phonemizing doesn't involve the model, so only the inference itself counts against it
+        ids = voice.phonemes_to_ids(voice.phonemize("Ready.")[0])
+        try:
+            audio = self.run_voice(voice, ids, 1.0)
+        except Exception as e:
+            print(f"Error checking the voice model: {e}")
+            return False
+        return bool(np.isfinite(audio).all() and np.abs(audio).max() > 1e-3)
+
+    def create_voice(self, source_path: str) -> FastPiperVoice:
+        """Create a Piper voice, reusing the graph ORT optimized for it on a previous launch."""
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config = PiperConfig.from_dict(json.load(f))
+        # Optimized graphs can contain provider-specific nodes, so cache one per provider
+        provider_name = self.providers[0].replace("ExecutionProvider", "").lower()
+        optimized_path = f"{source_path}.{provider_name}.opt.onnx"
+        if Path(optimized_path).exists():
+            try:
+                return FastPiperVoice(session=self.create_session(optimized_path), config=config)
+            except Exception as e:
+                # e.g. a graph saved by another ONNX Runtime version; build it again from the source model
+                print(f"Error loading the optimized voice model, rebuilding it: {e}")
+                os.remove(optimized_path)
+        # ORT writes the optimized graph while creating the session; move it into place once that succeeds
+        partial_path = f"{optimized_path}.part"
+        session = self.create_session(source_path, partial_path)
+        if Path(partial_path).exists():
+            os.replace(partial_path, optimized_path)
+        return FastPiperVoice(session=session, config=config)
+
+    def create_session(self, model_path: str, optimized_path: str = None) -> onnxruntime.InferenceSession:
+        """Create an ONNX session tuned for concurrent synthesis, saving its optimized graph to optimized_path."""
+        sess_options = onnxruntime.SessionOptions()
+        if optimized_path:
+            # ORT_ENABLE_ALL adds layout changes specific to this machine, so only portable optimizations are saved
+            sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+            sess_options.optimized_model_filepath = optimized_path
+        else:
+            # A saved graph is already fused, so loading it only adds this machine's layout optimizations
+            sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Keep each inference single-threaded so parallel workers don't oversubscribe the cores
+        sess_options.intra_op_num_threads = 1
+        sess_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        return onnxruntime.InferenceSession(
+            model_path, sess_options=sess_options, providers=self.providers,
+            provider_options=[PROVIDER_OPTIONS.get(provider, {}) for provider in self.providers])
+
+    def simplify_model(self) -> str:
+        """Return the path of a constant-folded copy of the voice model, creating it on first use.
+
+        Falls back to the original model when the optional onnxsim package isn't installed or can't simplify it.
+        """
+        simplified_path = str(Path(self.model_path).with_suffix(".sim.onnx"))
+        if not Path(simplified_path).exists():
+            try:
+                import onnx
+                import onnxsim
+            except ImportError:
+                return self.model_path
+            try:
+                model, check = onnxsim.simplify(onnx.load(self.model_path))
+            except Exception as e:
+                print(f"Error simplifying voice model: {e}")
+                return self.model_path
+            if not check:
+                return self.model_path
+            # Save to a temporary file so an interrupted first launch can't leave a truncated model behind
+            partial_path = f"{simplified_path}.part"
+            onnx.save(model, partial_path)
+            os.replace(partial_path, simplified_path)
+        return simplified_path
+
+    def quantize_model(self, model_path: str) -> str:
+        """Return the path of an int8 copy of a model, creating it on first use."""
+        quantized_path = str(Path(model_path).with_suffix(".int8.onnx"))
+        if not Path(quantized_path).exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            # Quantize to a temporary file so an interrupted first launch can't leave a truncated model behind
+            partial_path = f"{quantized_path}.part"
+            # Signed int8 weights; QUInt8 dynamic quantization is much slower on the vocoder's convolutions
+            quantize_dynamic(model_path, partial_path, weight_type=QuantType.QInt8)
+            os.replace(partial_path, quantized_path)
+        return quantized_path
 
     def download_file(self, url: str, path: str) -> None:
-        """Download a file from a URL to the specified path."""
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        with open(path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-    def synthesize_to_file(self, text: str, wav_file_path: Union[Path, str], length_scale: float = 1.0) -> None:
-        """Synthesize text to a WAV file."""
-        with wave.open(str(wav_file_path), "wb") as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(22050)
-            self.voice_model.synthesize(text, wav_file, length_scale=length_scale)
+        """Download a file from a URL to the specified path, resuming an interrupted download."""
+        partial_path = f"{path}.part"
+        if not os.path.exists(partial_path) and self.download_ranges(url, path):
+            return
+        offset = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+        headers = {'Range': f"bytes={offset}-"} if offset else {}
+        with HTTP_SESSION.get(url, stream=True, headers=headers) as response:
+            # 416 means the partial file already holds the whole body
+            if response.status_code != 416:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                # Servers that ignore the range send the whole body again with a 200
+                with open(partial_path, 'ab' if response.status_code == 206 else 'wb') as f:
+                    # Copy straight from the socket in C, a whole block per write
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+        # Only a complete download gets the real name, so an interrupted one is never loaded
+        os.replace(partial_path, path)
+
+    def download_ranges(self, url: str, path: str) -> bool:
+        """Download a large file over several connections at once.
+
+        Returns False if the file is small, the server doesn't accept byte ranges or any range fails,
+        leaving the caller to fetch the file over a single connection.
+        """
+        try:
+            with HTTP_SESSION.head(url, allow_redirects=True) as response:
+                response.raise_for_status()
+                total = int(response.headers.get('Content-Length', 0))
+                if response.headers.get('Accept-Ranges') != 'bytes' or total < PARALLEL_DOWNLOAD_MIN_SIZE:
+                    return False
+                # Fetch every range from where the redirects lead instead of following them once per connection
+                url = response.url
+        except requests.RequestException as e:
+            print(f"Parallel download unavailable: {e}")
+            return False
+        segments_path = f"{path}.segments"
+        with open(segments_path, 'wb') as f:
+            f.truncate(total)
+        size = -(-total // DOWNLOAD_CONNECTIONS)
+        ranges = [(start, min(start + size, total) - 1) for start in range(0, total, size)]
+        # Daemon threads, like the job running this, so closing the app mid-download doesn't wait for it
+        results = [False] * len(ranges)
+
+        def fetch(index: int, start: int, end: int) -> None:
+            try:
+                results[index] = self.download_range(url, segments_path, start, end)
+            except requests.RequestException as e:
+                print(f"Error downloading bytes {start}-{end}: {e}")
+
+        threads = [threading.Thread(target=fetch, args=(index, *bounds), daemon=True)
+                   for index, bounds in enumerate(ranges)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if not all(results):
+            os.remove(segments_path)
+            return False
+        os.replace(segments_path, path)
+        return True
+
+    def download_range(self, url: str, path: str, start: int, end: int) -> bool:
+        """Download bytes start..end of a URL into the same offsets of an existing file."""
+        with HTTP_SESSION.get(url, stream=True, headers={'Range': f"bytes={start}-{end}"}) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                return False
+            with open(path, 'r+b') as f:
+                f.seek(start)
+                while block := response.raw.read(DOWNLOAD_CHUNK_SIZE):
+                    f.write(block)
+                return f.tell() == end + 1
+
+    def synthesize_to_pcm(self, text: str, length_scale: float = 1.0) -> bytes:
+        """Synthesize text to raw 16-bit mono PCM."""
+        return b"".join(self.voice_model.synthesize_stream_raw(text, length_scale=length_scale))
+
+    @staticmethod
+    def run_voice(voice: FastPiperVoice, phoneme_ids: list, length_scale: float) -> np.ndarray:
+        """Run a phoneme id sequence through a voice's model and return the float waveform."""
+        config = voice.config
+        inputs = {
+            "input": np.array([phoneme_ids], dtype=np.int64),
+            "input_lengths": np.array([len(phoneme_ids)], dtype=np.int64),
+            "scales": np.array([config.noise_scale, length_scale, config.noise_w], dtype=np.float32),
+        }
+        if config.num_speakers > 1:
+            inputs["sid"] = np.zeros(1, dtype=np.int64)
+        return voice.session.run(None, inputs)[0].squeeze()
 
 
 class BookReader:
     def __init__(self):
         """Initialize the BookReader application."""
-        pygame.mixer.init()
+        pygame.mixer.init(frequency=MIXER_FREQUENCY, size=-16, channels=1, buffer=MIXER_BUFFER)
         self.window = tk.Tk()
         self.window.title("Book Reader")
         self.window.geometry("400x650")
         self.window.minsize(400, 350)
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-        self.tts = TTS()
         self.current_file = None
         self.duration = None
         self.last_folder = str(Path.home())
+        self.quantize = True
+        # Known durations by audio path, stored as [mtime, size, seconds]
+        self.durations = {}
+        # Validators and synthesized audio of downloaded URLs, so unchanged books aren't fetched again
+        self.downloads = {}
         self.position = 0.0   # in seconds
         self.is_playing = False
         self.is_paused = False
         self.is_processing = False
         self.cancel_processing = False
         self.config_path = Path.home() / ".bookreader_config.json"
+        # The TTS engine is only loaded once a text file needs synthesizing
+        self.tts = None
+        self.tts_lock = threading.Lock()
+        # Background jobs queue up for a few daemon workers, so closing the window never waits for one to finish
+        self.jobs = queue.Queue()
+        for _ in range(BACKGROUND_WORKERS):
+            threading.Thread(target=self.run_jobs, daemon=True).start()
         self.temp_dir = Path(".temp_audio")
         self.temp_dir.mkdir(exist_ok=True)
-
+        self.chunk_cache_dir = self.temp_dir / "cache"
+        self.chunk_cache_dir.mkdir(exist_ok=True)
+        # Scratch space for this run's downloads and partial WAVs, removed in one go on exit
+        self.remove_stale_sessions()
+        # Named after our process id, so a later launch can tell whether we're still running
+        self.session_dir = Path(tempfile.mkdtemp(prefix=f"bookreader-{os.getpid()}-", dir=self.temp_dir))
+        atexit.register(shutil.rmtree, self.session_dir, ignore_errors=True)
+
+        # UI updates posted by worker threads, which must never touch Tk themselves
+        self.ui_queue = queue.Queue()
+        # Last state applied to each button, so unchanged buttons aren't reconfigured
+        self._button_states = {}
+        # Pending apply_canvas_width callback and the latest canvas width it should apply
+        self._resize_job = None
+        self._canvas_width = None
         # Flag to suspend scrollbar event while programmatically updating its value
         self.suspend_scroll_event = False
+        # Pending update_position callback and the last playback second drawn by it
+        self._position_job = None
+        self._last_second_shown = None
+        # File currently loaded into pygame.mixer.music, so replays and seeks don't reload it
+        self._loaded_file = None
+        # Pending flush_config callback scheduled by save_config
+        self._save_job = None
+        # Previewing a text file while it is still being converted: chunks are read back from the chunk cache
+        # one at a time as they are written, so only the chunk being queued is held in memory
+        self.preview_channel = pygame.mixer.Channel(0)
+        self.preview_chunks = []
+        self.preview_ready = 0
+        self.preview_next = 0
+        self.preview_active = False
+        self.preview_target = None
+        self.preview_started = None
+        self.preview_seconds = 0.0
+        self._preview_job = None
 
         self.setup_ui()
         self.load_config()
         self.setup_keybindings()
+        self.drain_ui_queue()
         if self.current_file:
             self.calculate_duration()
+            # Load the restored book now so the first play doesn't have to open and parse it
+            try:
+                self.load_audio()
+            except pygame.error as e:
+                print(f"Error loading audio file: {e}")
+
+    def load_tts(self) -> TTS:
+        """Load the TTS engine unless it's already loaded, quantizing the voice model on first launch if enabled."""
+        with self.tts_lock:
+            if self.tts is None:
+                self.set_status_bar("Optimizing model..." if self.quantize else "Loading voice model...")
+                self.tts = TTS(quantize=self.quantize)
+                self.call_in_ui(self.update_status_bar)
+        return self.tts
+
+    def call_in_ui(self, fn, *args) -> None:
+        """Queue fn to run on the Tk thread; safe to call from any thread."""
+        self.ui_queue.put((fn, args))
+
+    def drain_ui_queue(self) -> None:
+        """Run the UI updates queued by worker threads, checking again every UI_QUEUE_POLL_MS."""
+        # Reschedule first so an update that raises doesn't stop the queue being drained
+        self.window.after(UI_QUEUE_POLL_MS, self.drain_ui_queue)
+        while True:
+            try:
+                fn, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            fn(*args)
+
+    def run_in_background(self, fn, *args) -> None:
+        """Queue a job for the background workers."""
+        self.jobs.put((fn, args))
+
+    def run_jobs(self) -> None:
+        """Run queued background jobs one after another, reporting any exception they raise."""
+        while True:
+            fn, args = self.jobs.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Background job failed: {e}")
 
     def download_url(self) -> None:
         """Download a file from a URL."""
@@ -105,7 +528,8 @@ class BookReader:
         self.cancel_processing = False
         self.status_bar.config(text="Downloading...")
         self.update_button_states()
-        threading.Thread(target=self._download_url_thread, args=(url,), daemon=True).start()
+        self.start_preview()
+        self.run_in_background(self._download_url_thread, url)
 
     def setup_ui(self) -> None:
         """Set up the user interface with a scrollable frame."""
@@ -151,6 +575,8 @@ class BookReader:
         self.skip_back_button.pack(fill=tk.X, pady=5)
         self.skip_forward_button = tk.Button(self.inner_frame, text="10s >", command=self.skip_forward)
         self.skip_forward_button.pack(fill=tk.X, pady=5)
+        self.export_button = tk.Button(self.inner_frame, text="Export MP3", command=self.export_mp3)
+        self.export_button.pack(fill=tk.X, pady=5)
         self.cancel_button = tk.Button(self.inner_frame, text="Cancel", command=self.cancel, state=tk.DISABLED)
         self.cancel_button.pack(fill=tk.X, pady=5)
 
@@ -178,7 +604,11 @@ class BookReader:
             self.stop()
         if self.is_processing:
             self.cancel()
-            time.sleep(0.5)
+        # Write out any save still waiting on its debounce delay
+        if self._save_job is not None:
+            self.window.after_cancel(self._save_job)
+            self.flush_config()
+        self.stop_preview()
         pygame.mixer.quit()
         self.window.destroy()
 
@@ -190,6 +620,11 @@ class BookReader:
                 self.current_file = config.get('audio_file')
                 self.position = config.get('position', 0)
                 self.last_folder = config.get('last_folder', str(Path.home()))
+                self.quantize = config.get('quantize', True)
+                self.durations = {path: entry for path, entry in config.get('durations', {}).items()
+                                  if os.path.exists(path)}
+                self.downloads = {url: entry for url, entry in config.get('downloads', {}).items()
+                                  if os.path.exists(entry['audio_file'])}
             if self.current_file and not os.path.exists(self.current_file):
                 self.current_file = None
             self.current_file_label.config(
@@ -198,29 +633,103 @@ class BookReader:
             self.update_playback_scrollbar()
 
     def save_config(self) -> None:
+        """Schedule a config save, coalescing calls made within CONFIG_SAVE_DELAY_MS."""
+        if self._save_job is None:
+            self._save_job = self.window.after(CONFIG_SAVE_DELAY_MS, self.flush_config)
+
+    def flush_config(self) -> None:
         """Save current configuration to a JSON file."""
+        self._save_job = None
         config = {
             'audio_file': self.current_file,
             'position': self.position,
-            'last_folder': self.last_folder
+            'last_folder': self.last_folder,
+            'quantize': self.quantize,
+            'durations': self.durations,
+            'downloads': self.downloads
         }
-        with open(self.config_path, 'w') as f:
-            json.dump(config, f)
+        # Write to a temporary file and swap it in so a crash can't leave truncated JSON behind
+        temp_path = self.config_path.with_suffix('.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(config, f, separators=(',', ':'))
+        os.replace(temp_path, self.config_path)
 
     def calculate_duration(self) -> None:
-        """Start calculating the audio duration in a background thread."""
+        """Read the audio duration from the file header, or calculate it in a background thread."""
         if self.duration is None and self.current_file:
-            self.status_bar.config(text="Calculating duration...")
-            threading.Thread(target=self._calculate_duration_thread, daemon=True).start()
+            cached = self.durations.get(self.current_file)
+            if cached and cached[:2] == self.file_signature(self.current_file):
+                self.duration = cached[2]
+                self.call_in_ui(self._update_ui_after_duration)
+                return
+            duration = self.read_header_duration(self.current_file)
+            if duration is not None:
+                self.duration = int(duration)
+                self.remember_duration(self.current_file)
+                self.call_in_ui(self._update_ui_after_duration)
+                return
+            self.set_status_bar("Calculating duration...")
+            self.run_in_background(self._calculate_duration_thread)
+
+    def file_signature(self, path: str) -> list:
+        """Return [mtime, size] of a file, or an empty list if it can't be read."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return []
+        return [stat.st_mtime, stat.st_size]
+
+    def remember_duration(self, path: str) -> None:
+        """Store the current duration for path so later launches can skip calculating it."""
+        signature = self.file_signature(path)
+        if signature:
+            # Stored on the Tk thread, which is the one that serializes the config
+            self.call_in_ui(self._store_duration, path, signature + [self.duration])
+
+    def _store_duration(self, path: str, entry: list) -> None:
+        self.durations[path] = entry
+        self.save_config()
+
+    def read_header_duration(self, path: str) -> Union[float, None]:
+        """Return the duration in seconds from WAV/MP3 headers alone, or None if unavailable."""
+        try:
+            if path.endswith('.wav'):
+                return self.read_wav_duration(path)
+            if path.endswith('.mp3'):
+                import mutagen.mp3
+                # Our exports are CBR with an Info header, so this never scans the frames
+                return mutagen.mp3.MP3(path).info.length
+        except Exception as e:
+            print(f"Error reading duration header: {e}")
+        return None
+
+    def read_wav_duration(self, path: str) -> Union[float, None]:
+        """Return the duration of a WAV file by walking its RIFF chunk headers in a memory map."""
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+                return None
+            byte_rate = None
+            offset = 12
+            while offset + 8 <= len(data):
+                chunk_id, size = struct.unpack_from('<4sI', data, offset)
+                if chunk_id == b'fmt ':
+                    byte_rate = struct.unpack_from('<I', data, offset + 16)[0]
+                elif chunk_id == b'data' and byte_rate:
+                    # Streamed writers may leave the size unset, so never count past the end of the file
+                    return min(size, len(data) - offset - 8) / byte_rate
+                offset += 8 + size + (size & 1)
+        return None
 
     def _calculate_duration_thread(self):
         try:
+            import mutagen
             audio = mutagen.File(self.current_file)
             self.duration = int(audio.info.length)
+            self.remember_duration(self.current_file)
         except Exception as e:
             print(f"Error calculating duration: {e}")
             self.duration = 0
-        self.window.after(0, self._update_ui_after_duration)
+        self.call_in_ui(self._update_ui_after_duration)
 
     def _update_ui_after_duration(self) -> None:
         """Update the UI after duration calculation."""
@@ -232,33 +741,31 @@ class BookReader:
         return self.duration if self.duration is not None else 0
 
     def update_button_states(self):
+        busy = pygame.mixer.music.get_busy()
         # Play button enabled only if a file is selected and not currently playing
-        if self.current_file and not self.is_playing and not pygame.mixer.music.get_busy():
-            self.play_button.config(state='normal')
-        else:
-            self.play_button.config(state='disabled')
+        self.set_button_state(self.play_button, bool(self.current_file and not self.is_playing and not busy))
         # Pause enabled only when playing
-        if self.is_playing:
-            self.pause_button.config(state='normal')
-        else:
-            self.pause_button.config(state='disabled')
+        self.set_button_state(self.pause_button, self.is_playing)
         # Resume enabled only when paused
-        if self.is_paused:
-            self.resume_button.config(state='normal')
-        else:
-            self.resume_button.config(state='disabled')
-        # Stop enabled if something is playing or paused
-        if pygame.mixer.music.get_busy() or self.is_paused:
-            self.stop_button.config(state='normal')
-        else:
-            self.stop_button.config(state='disabled')
-        if self.current_file:
-            self.skip_back_button.config(state='normal')
-            self.skip_forward_button.config(state='normal')
-        else:
-            self.skip_back_button.config(state='disabled')
-            self.skip_forward_button.config(state='disabled')
-        self.cancel_button.config(state='normal' if self.is_processing else 'disabled')
+        self.set_button_state(self.resume_button, self.is_paused)
+        # Stop enabled if something is playing or paused, including the preview of a book being converted
+        self.set_button_state(self.stop_button, busy or self.is_paused or self.preview_started is not None)
+        self.set_button_state(self.skip_back_button, bool(self.current_file))
+        self.set_button_state(self.skip_forward_button, bool(self.current_file))
+        # Export enabled for synthesized (WAV) books while nothing else is being processed
+        self.set_button_state(self.export_button, bool(
+            self.current_file and self.current_file.endswith('.wav') and not self.is_processing))
+        self.set_button_state(self.cancel_button, self.is_processing)
+        # Only one file is loaded or downloaded at a time
+        self.set_button_state(self.select_button, not self.is_processing)
+        self.set_button_state(self.download_button, not self.is_processing)
+
+    def set_button_state(self, button: tk.Button, enabled: bool) -> None:
+        """Enable or disable a button, skipping the Tk call if its state wouldn't change."""
+        state = 'normal' if enabled else 'disabled'
+        if self._button_states.get(button) != state:
+            button.config(state=state)
+            self._button_states[button] = state
 
     def update_playback_scrollbar(self) -> None:
         """Update the playback scrollbar based on the current duration and position."""
@@ -282,58 +789,97 @@ class BookReader:
         new_position = float(value)
         self.position = new_position
         self.update_status_bar()
-        # If the user drags the scrollbar while playing or paused, restart playback from the new position.
+        # If the user drags the scrollbar while playing or paused, seek to the new position.
         if self.is_playing or self.is_paused:
-            pygame.mixer.music.stop()
-            self.play()
+            self.seek()
         self.save_config()
 
     def on_canvas_configure(self, event):
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        self.canvas.itemconfigure(self.canvas_window, width=event.width)
+        """Fit the inner frame to the canvas width, at most once per RESIZE_DEBOUNCE_MS while resizing."""
+        self._canvas_width = event.width
+        if self._resize_job is None:
+            self._resize_job = self.window.after(RESIZE_DEBOUNCE_MS, self.apply_canvas_width)
+
+    def apply_canvas_width(self) -> None:
+        self._resize_job = None
+        # The inner frame's own <Configure> binding updates the scroll region when its size changes
+        self.canvas.itemconfigure(self.canvas_window, width=self._canvas_width)
 
     def _download_url_thread(self, url: str) -> None:
         """Download a file from a URL in a background thread."""
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
             file_name = url.split('/')[-1] or "downloaded.txt"
             if not file_name.endswith('.txt'):
                 file_name += '.txt'
-            download_path = self.temp_dir / file_name
-
-            with open(download_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if self.cancel_processing:
-                        break
-                    f.write(chunk)
-
-            if not self.cancel_processing and os.path.exists(download_path):
-                self.duration = None
-                self.current_file = self.prepare_audio_file(str(download_path))
-                if self.current_file:
+            # Only the synthesized audio is kept, so the text can live in the session directory
+            download_path = self.session_dir / file_name
+
+            # Revalidate a previous download instead of fetching it again if its audio is still around
+            headers = {}
+            cached = self.downloads.get(url)
+            if cached and os.path.exists(cached['audio_file']):
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+
+            audio_file = None
+            with HTTP_SESSION.get(url, stream=True, headers=headers) as response:
+                if response.status_code == 304:
+                    audio_file = cached['audio_file']
+                else:
+                    response.raise_for_status()
+                    # Downloads are always text to synthesize, so load the TTS engine while the body arrives
+                    self.run_in_background(self.load_tts)
+                    response.raw.decode_content = True
+                    total = int(response.headers.get('Content-Length', 0))
+                    with open(download_path, 'wb') as f:
+                        # Reserve the whole file up front to avoid fragmentation and per-chunk metadata updates
+                        if total > 0 and hasattr(os, 'posix_fallocate'):
+                            os.posix_fallocate(f.fileno(), 0, total)
+                        # Copy a block at a time so cancellation is still noticed between blocks
+                        while not self.cancel_processing and (block := response.raw.read(DOWNLOAD_CHUNK_SIZE)):
+                            f.write(block)
+                        # Drop any reserved space the body didn't fill (e.g. transparently decompressed responses)
+                        f.truncate()
+                validators = {'etag': response.headers.get('ETag'),
+                              'last_modified': response.headers.get('Last-Modified')}
+
+            if not self.cancel_processing and (audio_file or os.path.exists(download_path)):
+                audio_file = audio_file or self.prepare_audio_file(str(download_path))
+                if not self.cancel_processing and audio_file:
+                    # Only replace the current book once its audio is ready, so a failure keeps the old one intact
+                    self.current_file = audio_file
+                    self.duration = None
+                    if validators['etag'] or validators['last_modified']:
+                        self.call_in_ui(self._store_download, url, {**validators, 'audio_file': self.current_file})
                     self.position = 0
-                    self.current_file_label.config(text=os.path.basename(self.current_file))
+                    self.set_current_file_label(os.path.basename(self.current_file))
                     self.calculate_duration()
-                    self.save_config()
+                    self.call_in_ui(self.save_config)
                     self.set_error_label("")
-                    self.status_bar.config(text="Ready")
+                    self.set_status_bar("Ready")
             else:
-                self.status_bar.config(text="Download cancelled")
-                if os.path.exists(download_path):
-                    os.remove(download_path)
+                self.set_status_bar("Download cancelled")
         except requests.RequestException as e:
             self.set_error_label(f"Download failed: {str(e)}")
-            self.status_bar.config(text=f"Download failed: {str(e)}")
+            self.set_status_bar(f"Download failed: {str(e)}")
+        except Exception as e:
+            self.set_error_label(f"Loading failed: {str(e)}")
         finally:
             self.is_processing = False
-            self.update_button_states()
+            self.call_in_ui(self.update_button_states)
+            self.call_in_ui(self.finish_preview)
+
+    def _store_download(self, url: str, entry: dict) -> None:
+        self.downloads[url] = entry
+        self.save_config()
 
     def select_file(self) -> None:
         """Open a file dialog to select a text or audio file."""
         file_path = filedialog.askopenfilename(
             initialdir=self.last_folder,
-            filetypes=[("Text files", "*.txt"), ("Audio files", "*.wav *.mp3")]
+            filetypes=[("Text files", "*.txt"), ("Audio files", "*.wav *.mp3 *.ogg")]
         )
         if file_path:
             self.last_folder = str(Path(file_path).parent)
@@ -341,47 +887,105 @@ class BookReader:
             self.cancel_processing = False
             self.status_bar.config(text="Loading file...")
             self.update_button_states()
-            threading.Thread(target=self._select_file_thread, args=(file_path,), daemon=True).start()
+            self.start_preview()
+            self.run_in_background(self._select_file_thread, file_path)
 
     def _select_file_thread(self, file_path: str):
-        self.duration = None
-        self.current_file = self.prepare_audio_file(file_path)
-        if not self.cancel_processing and self.current_file:
-            self.position = 0
-            self.set_current_file_label(os.path.basename(self.current_file))
-            self.calculate_duration()
-            self.save_config()
+        try:
+            audio_file = self.prepare_audio_file(file_path)
+            if not self.cancel_processing and audio_file:
+                # Only replace the current book once its audio is ready, so a failure keeps the old one intact
+                self.current_file = audio_file
+                self.duration = None
+                self.position = 0
+                self.set_current_file_label(os.path.basename(self.current_file))
+                self.calculate_duration()
+                self.call_in_ui(self.save_config)
+                self.set_error_label("")
+                self.set_status_bar("Ready")
+            else:
+                self.set_status_bar("File selection cancelled")
+        except Exception as e:
+            self.set_error_label(f"Loading failed: {str(e)}")
+        finally:
+            self.call_in_ui(self.update_ui_after_processing)
+
+    def export_mp3(self) -> None:
+        """Export the current WAV audio to an MP3 file chosen by the user."""
+        if not self.current_file:
+            return
+        export_path = filedialog.asksaveasfilename(
+            initialdir=self.last_folder,
+            initialfile=f"{Path(self.current_file).stem}.mp3",
+            defaultextension=".mp3",
+            filetypes=[("MP3 files", "*.mp3")]
+        )
+        if export_path:
+            self.is_processing = True
+            self.status_bar.config(text="Exporting MP3...")
+            self.update_button_states()
+            self.run_in_background(self._export_mp3_thread, self.current_file, export_path)
+
+    def _export_mp3_thread(self, wav_path: str, export_path: str):
+        try:
+            import lameenc
+            # Encode in-process, streaming the WAV a block at a time
+            with wave.open(wav_path, 'rb') as wav_file:
+                # lameenc only takes 16-bit PCM; anything else would be encoded as noise
+                if wav_file.getsampwidth() != 2:
+                    raise ValueError("only 16-bit WAV files can be exported")
+                encoder = lameenc.Encoder()
+                # Export with a constant bitrate to avoid decoding issues
+                encoder.set_bit_rate(MP3_BITRATE)
+                encoder.set_quality(MP3_QUALITY)
+                encoder.set_in_sample_rate(wav_file.getframerate())
+                encoder.set_channels(wav_file.getnchannels())
+                with open(export_path, 'wb') as mp3_file:
+                    while frames := wav_file.readframes(1 << 16):
+                        mp3_file.write(encoder.encode(frames))
+                    mp3_file.write(encoder.flush())
             self.set_error_label("")
-            self.set_status_bar("Ready")
-        else:
-            self.set_status_bar("File selection cancelled")
-        self.window.after(0, self.update_ui_after_processing)
+        except Exception as e:
+            self.set_error_label(f"Export failed: {str(e)}")
+        self.call_in_ui(self.update_ui_after_processing)
 
     def smart_chunk_text(self, text: str, base_size: int = 1000, max_extra: int = 512) -> list:
         """Split text into chunks at logical boundaries."""
-        chunks = []
+        return [text[start:end] for start, end in self.chunk_bounds(text, base_size, max_extra)]
+
+    def chunk_bounds(self, text: str, base_size: int = 1000, max_extra: int = 512) -> list:
+        """Return (start, end) offsets of whitespace-trimmed, non-empty chunks of text."""
+        # Find every candidate boundary in one regex pass, then binary-search it for each chunk
+        boundary_starts = []
+        boundary_ends = []
+        for match in SENTENCE_BOUNDARY.finditer(text):
+            boundary_starts.append(match.start())
+            boundary_ends.append(match.end())
+
+        bounds = []
         start = 0
         while start < len(text):
             end = min(start + base_size, len(text))
             if end < len(text):
                 extra_end = min(end + max_extra, len(text))
-                full_stop = text.find('.', end, extra_end)
-                double_newline = text.find('\n\n', end, extra_end)
-
-                if full_stop != -1 and (double_newline == -1 or full_stop < double_newline):
-                    end = full_stop + 1
-                elif double_newline != -1:
-                    end = double_newline + 2
+                index = bisect.bisect_left(boundary_starts, end)
+                if index < len(boundary_starts) and boundary_ends[index] <= extra_end:
+                    end = boundary_ends[index]
                 else:
                     end = extra_end
 
-            chunks.append(text[start:end].strip())
+            # Trim by moving the offsets rather than copying the chunk with strip()
+            chunk_start, chunk_end = start, end
+            while chunk_start < chunk_end and text[chunk_start].isspace():
+                chunk_start += 1
+            while chunk_end > chunk_start and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+            if chunk_start < chunk_end:
+                bounds.append((chunk_start, chunk_end))
             start = end
-        return chunks
+        return bounds
 
     def prepare_audio_file(self, file_path: str) -> Union[str, None]:
-        output_mp3 = self.temp_dir / f"{Path(file_path).stem}.mp3"
-
         if file_path.endswith('.txt'):
             with open(file_path, 'r', encoding='utf-8') as f:
                 text = f.read().strip()
@@ -389,55 +993,181 @@ class BookReader:
                 self.set_error_label("Text file is empty")
                 return None
 
+            self.load_tts()
+            # Name the output after the text and voice settings so an unchanged book is never synthesized twice
+            key = hashlib.sha256(f"{self.tts.voice}|{self.tts.quantize}|{text}".encode('utf-8')).hexdigest()
+            output_wav = self.temp_dir / f"{Path(file_path).stem}-{key[:16]}.wav"
+            if output_wav.exists():
+                # Mark as recently used for eviction
+                os.utime(output_wav)
+                return str(output_wav)
+
             chunks = self.smart_chunk_text(text)
-            wav_files = []
             total_chunks = len(chunks)
 
-            for i, chunk in enumerate(chunks):
-                if self.cancel_processing:
-                    for wav in wav_files:
-                        if os.path.exists(wav):
-                            os.remove(wav)
-                    return None
-                temp_wav = self.temp_dir / f"chunk_{i}.wav"
-                self.tts.synthesize_to_file(chunk, temp_wav)
-                wav_files.append(temp_wav)
-                self.set_status_bar(f"Converting TTS: {i + 1}/{total_chunks} chunks")
-
+            # Playback reads the PCM directly, so write it out as a WAV instead of encoding an MP3
+            partial_wav = self.session_dir / output_wav.name
+            # Chunks can only be previewed as Sounds if they already match the mixer's rate, format and channels
+            preview = self.preview_active and pygame.mixer.get_init() == (self.tts.sample_rate, -16, 1)
+            if preview:
+                self.preview_chunks = [self.chunk_cache_path(chunk) for chunk in chunks]
+                self.preview_target = str(output_wav)
+            with ThreadPoolExecutor(max_workers=self.tts.workers) as executor, \
+                    wave.open(str(partial_wav), "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(self.tts.sample_rate)
+                futures = deque(executor.submit(self.synthesize_chunk, chunk) for chunk in chunks)
+                last_status = 0.0
+                try:
+                    for i in range(total_chunks):
+                        if self.cancel_processing:
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            break
+                        # Stream each chunk to disk in order as soon as it's ready; only unwritten chunks stay in memory
+                        pcm = futures.popleft().result()
+                        wav_file.writeframesraw(pcm)
+                        if preview:
+                            self.preview_ready = i + 1
+                        now = time.monotonic()
+                        if now - last_status >= STATUS_UPDATE_INTERVAL or i + 1 == total_chunks:
+                            self.set_status_bar(f"Converting TTS: {i + 1}/{total_chunks} chunks")
+                            last_status = now
+                except Exception:
+                    # Don't synthesize the rest of a book that can no longer be finished
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    wav_file.close()
+                    partial_wav.unlink(missing_ok=True)
+                    raise
+
+            self.evict_cache(self.chunk_cache_dir, "*.pcm", CHUNK_CACHE_LIMIT)
             if self.cancel_processing:
-                for wav in wav_files:
-                    if os.path.exists(wav):
-                        os.remove(wav)
+                partial_wav.unlink(missing_ok=True)
                 return None
-
-            combined = AudioSegment.empty()
-            for i, wav in enumerate(wav_files):
-                if self.cancel_processing:
-                    combined = None
-                    break
-                combined += AudioSegment.from_wav(wav)
-                os.remove(wav)
-                self.set_status_bar(f"Combining audio: {i + 1}/{total_chunks} chunks")
-
-            if combined and not self.cancel_processing:
-                # Export with a constant bitrate to avoid decoding issues
-                combined.export(output_mp3, format="mp3", bitrate="128k")
-                return str(output_mp3)
-            return None
-        elif file_path.endswith(('.wav', '.mp3')) and os.path.exists(file_path):
+            os.replace(partial_wav, output_wav)
+            self.evict_cache(self.temp_dir, "*.wav", BOOK_CACHE_LIMIT, keep=(str(output_wav), self.current_file))
+            return str(output_wav)
+        elif file_path.endswith(('.wav', '.mp3', '.ogg')) and os.path.exists(file_path):
             return file_path
         return None
 
+    def chunk_cache_path(self, chunk: str) -> Path:
+        """Return where a chunk's PCM is cached for the current voice settings."""
+        key = hashlib.blake2b(f"{self.tts.voice}|{self.tts.quantize}|{chunk}".encode('utf-8'),
+                              digest_size=16).hexdigest()
+        return self.chunk_cache_dir / f"{key}.pcm"
+
+    def synthesize_chunk(self, chunk: str) -> bytes:
+        """Synthesize a chunk to PCM, reusing the cached audio if it was synthesized before."""
+        cache_path = self.chunk_cache_path(chunk)
+        try:
+            pcm = cache_path.read_bytes()
+            # Mark as recently used for eviction
+            os.utime(cache_path)
+            return pcm
+        except FileNotFoundError:
+            pass
+        pcm = self.tts.synthesize_to_pcm(chunk)
+        temp_path = cache_path.with_name(f"{cache_path.stem}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(pcm)
+        os.replace(temp_path, cache_path)
+        return pcm
+
+    def evict_cache(self, directory: Path, pattern: str, limit: int, keep: tuple = ()) -> None:
+        """Delete the least recently used files matching pattern until they fit in limit bytes."""
+        entries = []
+        for entry in directory.glob(pattern):
+            if str(entry) in keep:
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= limit:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def remove_stale_sessions(self) -> None:
+        """Delete session directories left behind by runs that crashed or were killed."""
+        for session_dir in self.temp_dir.glob("bookreader-*"):
+            pid = session_dir.name.split("-")[1]
+            if pid.isdigit() and process_running(int(pid)):
+                continue
+            shutil.rmtree(session_dir, ignore_errors=True)
+
+    def start_preview(self) -> None:
+        """Start previewing synthesized chunks as they arrive, unless something is already playing."""
+        self.stop_preview()
+        if self.is_playing or self.is_paused:
+            return
+        self.preview_active = True
+        self._preview_job = self.window.after(POSITION_UPDATE_MS, self.feed_preview)
+
+    def feed_preview(self) -> None:
+        """Keep the next synthesized chunk queued on the preview channel."""
+        self._preview_job = None
+        if not self.preview_active:
+            return
+        if self.preview_next < self.preview_ready and self.preview_channel.get_queue() is None:
+            sound = pygame.mixer.Sound(buffer=self.preview_chunks[self.preview_next].read_bytes())
+            self.preview_next += 1
+            if self.preview_channel.get_busy():
+                self.preview_channel.queue(sound)
+            else:
+                # Everything handed over so far has finished playing, so this chunk starts at preview_seconds
+                started = self.preview_started is None
+                self.preview_started = time.monotonic() - self.preview_seconds
+                self.preview_channel.play(sound)
+                if started:
+                    # Let Stop silence the preview
+                    self.update_button_states()
+            self.preview_seconds += sound.get_length()
+        self._preview_job = self.window.after(POSITION_UPDATE_MS, self.feed_preview)
+
+    def stop_preview(self) -> None:
+        """Stop the preview without affecting the conversion it follows."""
+        started = self.preview_started is not None
+        self.preview_active = False
+        if self._preview_job is not None:
+            self.window.after_cancel(self._preview_job)
+            self._preview_job = None
+        self.preview_channel.stop()
+        self.preview_chunks = []
+        self.preview_ready = 0
+        self.preview_next = 0
+        self.preview_target = None
+        self.preview_started = None
+        self.preview_seconds = 0.0
+        if started:
+            self.update_button_states()
+
+    def finish_preview(self) -> None:
+        """Hand a running preview over to normal playback of the finished file at the same point."""
+        if (self.preview_started is None or self.cancel_processing
+                or self.current_file != self.preview_target):
+            self.stop_preview()
+            return
+        position = min(time.monotonic() - self.preview_started, self.preview_seconds)
+        self.stop_preview()
+        self.position = position
+        self.play()
+
     def update_position(self):
         """Periodically update playback position using the mixer's get_pos()."""
+        self._position_job = None
         if self.is_playing and pygame.mixer.music.get_busy():
             # get_pos returns elapsed ms since play() (or unpause) was called.
             elapsed_ms = pygame.mixer.music.get_pos()
             if elapsed_ms >= 0:
                 self.position = self.play_start_position + (elapsed_ms / 1000.0)
-            self.update_playback_scrollbar()
-            self.update_status_bar()
-            self.window.after(100, self.update_position)
+            # Only redraw when the displayed second changes
+            if int(self.position) != self._last_second_shown:
+                self._last_second_shown = int(self.position)
+                self.update_playback_scrollbar()
+                self.update_status_bar()
+            self.schedule_position_update()
         # If playback stops naturally, update state
         elif not self.is_paused:
             self.is_playing = False
@@ -446,22 +1176,46 @@ class BookReader:
             self.update_status_bar()
             self.update_button_states()
 
+    def schedule_position_update(self) -> None:
+        """Schedule the next update_position tick, replacing any pending one."""
+        if self._position_job is not None:
+            self.window.after_cancel(self._position_job)
+        self._position_job = self.window.after(POSITION_UPDATE_MS, self.update_position)
+
     def play(self):
         if not self.current_file:
             return
-        # Reinitialize mixer to avoid state issues
-        pygame.mixer.quit()
-        pygame.mixer.init()
-        pygame.mixer.music.load(self.current_file)
+        self.stop_preview()
+        self.load_audio()
         # Start playback from the stored position (in seconds)
         pygame.mixer.music.play(start=self.position)
         self.is_playing = True
         self.is_paused = False
         # Store the base position for get_pos() calculations.
         self.play_start_position = self.position
+        self._last_second_shown = None
         self.update_button_states()
         self.update_status_bar()
-        self.window.after(100, self.update_position)
+        self.schedule_position_update()
+
+    def load_audio(self) -> None:
+        """Load the current file into the mixer unless it's already resident."""
+        if self.current_file and self._loaded_file != self.current_file:
+            pygame.mixer.music.load(self.current_file)
+            self._loaded_file = self.current_file
+
+    def seek(self) -> None:
+        """Move the loaded stream to the stored position without reloading the file."""
+        try:
+            pygame.mixer.music.set_pos(self.position)
+        except pygame.error:
+            # Codec can't seek in place, restart playback from the new position instead
+            pygame.mixer.music.stop()
+            self.play()
+            return
+        # get_pos() keeps counting from the last play(), so rebase on it rather than resetting
+        self.play_start_position = self.position - max(0, pygame.mixer.music.get_pos()) / 1000.0
+        self._last_second_shown = None
 
     def pause(self):
         if self.is_playing and pygame.mixer.music.get_busy():
@@ -477,13 +1231,14 @@ class BookReader:
             pygame.mixer.music.unpause()
             self.is_paused = False
             self.is_playing = True
-            # When resuming, update our base position using the stored position.
-            self.play_start_position = self.position
+            # get_pos() doesn't restart on unpause, so rebase on the time already played
+            self.play_start_position = self.position - max(0, pygame.mixer.music.get_pos()) / 1000.0
             self.update_button_states()
             self.status_bar.config(text="Playing...")
-            self.window.after(100, self.update_position)
+            self.schedule_position_update()
 
     def stop(self):
+        self.stop_preview()
         if pygame.mixer.music.get_busy() or self.is_paused:
             pygame.mixer.music.stop()
         self.is_playing = False
@@ -499,27 +1254,24 @@ class BookReader:
             total = self.get_audio_duration()
             self.position = min(total, self.position + 10) if total > 0 else self.position + 10
             if self.is_playing or self.is_paused:
-                pygame.mixer.music.stop()
-                self.play()
-            else:
-                self.update_playback_scrollbar()
-                self.update_status_bar()
+                self.seek()
+            self.update_playback_scrollbar()
+            self.update_status_bar()
             self.save_config()
 
     def skip_backward(self):
         if self.current_file:
             self.position = max(0, self.position - 10)
             if self.is_playing or self.is_paused:
-                pygame.mixer.music.stop()
-                self.play()
-            else:
-                self.update_playback_scrollbar()
-                self.update_status_bar()
+                self.seek()
+            self.update_playback_scrollbar()
+            self.update_status_bar()
             self.save_config()
 
     def cancel(self) -> None:
         """Cancel ongoing processing."""
         self.cancel_processing = True
+        self.stop_preview()
         self.status_bar.config(text="Cancelling...")
 
     def toggle_playback(self, event: tk.Event = None) -> None:
@@ -535,24 +1287,32 @@ class BookReader:
 
     def format_time(self, seconds: int) -> str:
         """Format seconds into HH:MM:SS."""
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-        return f"{int(hours):02d}:{int(minutes):02d}:{int(secs):02d}"
+        hours, remainder = divmod(int(seconds), 3600)
+        minutes, secs = divmod(remainder, 60)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
     def set_status_bar(self, text):
-        self.window.after(0, lambda: self.status_bar.config(text=text))
+        self.call_in_ui(lambda: self.status_bar.config(text=text))
 
     def set_current_file_label(self, text):
-        self.window.after(0, lambda: self.current_file_label.config(text=text))
+        self.call_in_ui(lambda: self.current_file_label.config(text=text))
 
     def set_error_label(self, text):
-        self.window.after(0, lambda: self.error_label.config(text=text))
+        self.call_in_ui(lambda: self.error_label.config(text=text))
 
     def update_ui_after_processing(self):
         self.is_processing = False
+        self.finish_preview()
+        # Load a newly selected file now so the first play or seek doesn't wait on it
+        if self.current_file and not self.is_playing and not self.is_paused:
+            try:
+                self.load_audio()
+            except pygame.error as e:
+                print(f"Error loading audio file: {e}")
         self.update_button_states()
-        self.set_status_bar("Ready")
+        # A preview handed over to playback has already put the playing status up
+        if not self.is_playing:
+            self.set_status_bar("Ready")
 
     def update_status_bar(self) -> None:
         """Update the status bar with current playback information."""
@@ -560,15 +1320,18 @@ class BookReader:
             return
         total = self.get_audio_duration()
         if self.duration is None and self.current_file:
-            self.status_bar.config(text="Calculating duration...")
-        elif self.is_playing or (pygame.mixer.music.get_busy() and not self.is_paused):
-            self.status_bar.config(
-                text=f"Playing - Position: {self.format_time(int(self.position))} / Total: {self.format_time(total)} / Remaining: {self.format_time(max(0, total - int(self.position)))}")
+            text = "Calculating duration..."
         elif self.current_file:
-            self.status_bar.config(
-                text=f"Stopped - Position: {self.format_time(int(self.position))} / Total: {self.format_time(total)} / Remaining: {self.format_time(max(0, total - int(self.position)))}")
+            playing = self.is_playing or (pygame.mixer.music.get_busy() and not self.is_paused)
+            position = int(self.position)
+            text = (f"{'Playing' if playing else 'Stopped'} - Position: {self.format_time(position)}"
+                    f" / Total: {self.format_time(total)}"
+                    f" / Remaining: {self.format_time(max(0, total - position))}")
         else:
-            self.status_bar.config(text="Ready")
+            text = "Ready"
+        # Skip the Tk call when the rendered text hasn't changed
+        if text != self.status_bar.cget("text"):
+            self.status_bar.config(text=text)
 
     def run(self) -> None:
         """Start the Tkinter main loop."""